@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Asynchronous FFmpeg Runner
+==========================
+
+Runs ffmpeg as an asyncio subprocess instead of ``subprocess.run``.
+
+ffmpeg is started with ``-progress pipe:1`` so its machine-readable progress
+report is streamed on stdout and turned into throughput, speed factor and ETA
+while the job runs. Only the last few lines of stderr are kept in a ring
+buffer for error reporting, so long jobs never accumulate their whole log in
+memory. Jobs can be cancelled, bounded by a timeout, and run concurrently
+from one event loop under a concurrency limit.
+
+Usage:
+    from ffmpeg_runner import run_ffmpeg_sync, print_progress
+
+    run_ffmpeg_sync(["ffmpeg", "-i", "video.mp4", "audio.wav"],
+                    on_progress=print_progress)
+"""
+
+import asyncio
+import re
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+# Number of stderr lines kept for error reporting
+DEFAULT_STDERR_LINES = 50
+
+# Number of ffmpeg processes run_many() allows at the same time
+DEFAULT_CONCURRENCY = 4
+
+# Seconds to wait for ffmpeg to exit after terminate() before killing it
+TERMINATE_GRACE = 5.0
+
+# Global options inserted right after the ffmpeg executable
+PROGRESS_ARGS = ["-hide_banner", "-nostdin", "-nostats", "-progress"]
+
+# Size of the chunks read from ffmpeg's stdout when it carries media data
+STDOUT_CHUNK_SIZE = 64 * 1024
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_PROGRESS_LINE_RE = re.compile(r"^[a-z0-9_]+=")
+
+
+@dataclass
+class FFmpegProgress:
+    """Latest progress report of a running ffmpeg job."""
+
+    frame: int = 0
+    fps: float = 0.0
+    out_time: float = 0.0  # seconds of media written so far
+    total_size: int = 0  # bytes written so far
+    speed: float = 0.0  # media seconds processed per wall-clock second
+    duration: Optional[float] = None  # total media duration, if known
+    elapsed: float = 0.0  # wall-clock seconds since the job started
+    done: bool = False
+
+    @property
+    def percent(self) -> Optional[float]:
+        """Completion percentage, or None when the duration is unknown."""
+        if not self.duration:
+            return None
+        return min(100.0, self.out_time / self.duration * 100)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds remaining, or None when it cannot be estimated."""
+        if self.done:
+            return 0.0
+        if not self.duration or self.speed <= 0:
+            return None
+        return max(0.0, (self.duration - self.out_time) / self.speed)
+
+    @property
+    def throughput(self) -> float:
+        """Output bytes written per wall-clock second."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total_size / self.elapsed
+
+    def format(self) -> str:
+        """Format the progress as a single status line."""
+        parts = []
+        if self.percent is not None:
+            parts.append(f"{self.percent:5.1f}%")
+        else:
+            parts.append(f"{_format_seconds(self.out_time)} done")
+        if self.frame:
+            parts.append(f"{self.frame} frames @ {self.fps:.1f} fps")
+        parts.append(f"{self.speed:.2f}x")
+        if self.throughput:
+            parts.append(f"{self.throughput / (1024 * 1024):.1f} MB/s")
+        if self.eta is not None:
+            parts.append(f"ETA {_format_seconds(self.eta)}")
+        return " | ".join(parts)
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a number of seconds as H:MM:SS or M:SS."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def _to_float(value: str) -> float:
+    """Parse an ffmpeg progress number, treating 'N/A' and junk as 0."""
+    try:
+        return float(value.rstrip("x"))
+    except ValueError:
+        return 0.0
+
+
+def parse_progress_line(line: str, progress: FFmpegProgress) -> bool:
+    """Apply one ``key=value`` line of ``-progress`` output to ``progress``.
+
+    Returns True when the line closes a progress block, i.e. when ``progress``
+    holds a complete, fresh report.
+    """
+    key, sep, value = line.strip().partition("=")
+    if not sep:
+        return False
+    value = value.strip()
+
+    if key == "frame":
+        progress.frame = int(_to_float(value))
+    elif key == "fps":
+        progress.fps = _to_float(value)
+    elif key in ("out_time_us", "out_time_ms"):
+        # Despite its name, out_time_ms is also reported in microseconds
+        progress.out_time = _to_float(value) / 1_000_000
+    elif key == "total_size":
+        progress.total_size = int(_to_float(value))
+    elif key == "speed":
+        progress.speed = _to_float(value)
+    elif key == "progress":
+        progress.done = value == "end"
+        return True
+    return False
+
+
+def parse_duration(line: str) -> Optional[float]:
+    """Extract the input duration from an ffmpeg ``Duration:`` stderr line."""
+    match = _DURATION_RE.search(line)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def print_progress(progress: FFmpegProgress) -> None:
+    """Render progress on a single, continuously updated console line."""
+    end = "\n" if progress.done else ""
+    print(f"\r🔄 {progress.format():<70}", end=end, flush=True)
+
+
+def build_command(cmd: Sequence[str], progress_pipe: int = 1) -> List[str]:
+    """Insert the progress reporting options after the ffmpeg executable."""
+    return [cmd[0], *PROGRESS_ARGS, f"pipe:{progress_pipe}", *cmd[1:]]
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    """Stop ffmpeg, escalating to kill() if it ignores terminate()."""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), TERMINATE_GRACE)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+async def run_ffmpeg(cmd: Sequence[str], duration: Optional[float] = None,
+                     on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+                     timeout: Optional[float] = None,
+                     stderr_lines: int = DEFAULT_STDERR_LINES,
+                     on_stdout: Optional[Callable[[bytes], None]] = None) -> Dict[str, Any]:
+    """Run an ffmpeg command, streaming its progress.
+
+    ``cmd`` is a regular ffmpeg command line starting with the executable.
+    When ``duration`` is not given it is read from ffmpeg's own input report,
+    so percentages and ETA are available for any job with a known length.
+
+    Commands that write media to ``pipe:1`` pass ``on_stdout``, which receives
+    the output in chunks; progress is then reported on stderr instead.
+
+    Raises ``subprocess.CalledProcessError`` when ffmpeg fails and
+    ``subprocess.TimeoutExpired`` when ``timeout`` elapses; both carry the
+    tail of stderr in their ``stderr`` attribute. If the awaiting task is
+    cancelled or a callback raises, ffmpeg is stopped before the exception
+    propagates.
+    """
+    full_cmd = build_command(cmd, progress_pipe=2 if on_stdout else 1)
+    progress = FFmpegProgress(duration=duration)
+    stderr_tail: Deque[str] = deque(maxlen=stderr_lines)
+    start = time.monotonic()
+
+    proc = await asyncio.create_subprocess_exec(
+        *full_cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    def handle_progress(line: str) -> None:
+        if parse_progress_line(line, progress):
+            progress.elapsed = time.monotonic() - start
+            if on_progress:
+                on_progress(progress)
+
+    async def read_stdout() -> None:
+        assert proc.stdout is not None
+        if on_stdout:
+            while True:
+                chunk = await proc.stdout.read(STDOUT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                on_stdout(chunk)
+        else:
+            async for raw in proc.stdout:
+                handle_progress(raw.decode("utf-8", errors="replace"))
+
+    async def read_stderr() -> None:
+        assert proc.stderr is not None
+        async for raw in proc.stderr:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if on_stdout and _PROGRESS_LINE_RE.match(line):
+                handle_progress(line)
+                continue
+            if progress.duration is None:
+                progress.duration = parse_duration(line)
+            stderr_tail.append(line)
+
+    async def communicate() -> int:
+        await asyncio.gather(read_stdout(), read_stderr())
+        return await proc.wait()
+
+    try:
+        returncode = await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _terminate(proc)
+        raise subprocess.TimeoutExpired(list(cmd), timeout or 0,
+                                        stderr="\n".join(stderr_tail))
+    except BaseException:
+        # Cancellation, or an exception from on_stdout/on_progress
+        await _terminate(proc)
+        raise
+
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, list(cmd),
+                                            stderr="\n".join(stderr_tail))
+
+    progress.elapsed = time.monotonic() - start
+    return {
+        'returncode': returncode,
+        'elapsed': progress.elapsed,
+        'progress': progress,
+        'stderr': "\n".join(stderr_tail),
+    }
+
+
+async def run_many(commands: Iterable[Sequence[str]],
+                   concurrency: int = DEFAULT_CONCURRENCY,
+                   on_progress: Optional[Callable[[int, FFmpegProgress], None]] = None,
+                   return_exceptions: bool = False,
+                   **kwargs: Any) -> List[Any]:
+    """Run several ffmpeg commands concurrently, at most ``concurrency`` at once.
+
+    ``on_progress`` receives the index of the command alongside its progress.
+    Remaining keyword arguments are passed to ``run_ffmpeg`` for every job.
+    Results are returned in command order. By default the first failure
+    cancels the remaining jobs, stopping their ffmpeg processes, and is then
+    re-raised; with ``return_exceptions`` a failed job yields its exception
+    and the others run to completion.
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, cmd: Sequence[str]) -> Dict[str, Any]:
+        callback = None
+        if on_progress:
+            def callback(progress: FFmpegProgress) -> None:
+                on_progress(index, progress)
+        async with semaphore:
+            return await run_ffmpeg(cmd, on_progress=callback, **kwargs)
+
+    tasks = [asyncio.ensure_future(run_one(i, cmd)) for i, cmd in enumerate(commands)]
+    if return_exceptions:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # gather() leaves the siblings running; stop them and wait until
+        # their ffmpeg processes are gone
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def run_ffmpeg_sync(cmd: Sequence[str], **kwargs: Any) -> Dict[str, Any]:
+    """Blocking wrapper around ``run_ffmpeg`` for non-async callers.
+
+    Inside a running event loop (async code, Jupyter) ``asyncio.run`` is not
+    allowed, so the job gets its own loop in a worker thread instead. The
+    caller still blocks until ffmpeg finishes, just like ``subprocess.run``;
+    async code that must not block should await ``run_ffmpeg`` directly.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_ffmpeg(cmd, **kwargs))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(run_ffmpeg(cmd, **kwargs))).result()
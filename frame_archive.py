@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Packed Frame Archive
+====================
+
+Stores extracted frames in one append-only container file per video instead
+of one small file per frame.
+
+An archive is a pair of files:
+
+    <name>.frames   the encoded images (JPEG, PNG, BMP or WebP) back to back,
+                    exactly as ffmpeg produced them
+    <name>.fidx     a fixed-size header followed by one fixed-size record per
+                    frame holding its offset, length and timestamp
+
+Because index records have a fixed size, any frame is found in O(1) by frame
+number or timestamp. Both files are memory-mapped for reading, so a frame is
+returned without reading anything but its own bytes.
+
+Usage:
+    python frame_archive.py <archive> [options]
+
+Example:
+    python frame_archive.py output/video_frames/video_frame.frames --frame 42
+    python frame_archive.py output/video_frames/video_frame.frames --time 90.5 -o ./stills
+"""
+
+import argparse
+import math
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+ARCHIVE_SUFFIX = ".frames"
+INDEX_SUFFIX = ".fidx"
+
+INDEX_MAGIC = b"WFIX"
+INDEX_VERSION = 1
+
+# magic, version, fps, image format
+INDEX_HEADER = struct.Struct("<4sH2xd8s")
+# offset into the container, length in bytes, timestamp in seconds
+INDEX_RECORD = struct.Struct("<QId")
+
+# Fraction of a frame interval by which a timestamp may fall short of a frame's
+# start and still select it; absorbs float error in seconds * fps
+TIMESTAMP_TOLERANCE = 1e-6
+
+# Formats whose frame boundaries can be recovered from an ffmpeg image2pipe stream
+PACKED_FORMATS = ['jpg', 'jpeg', 'png', 'bmp', 'webp']
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def index_path_for(archive_path: Path) -> Path:
+    """Return the index file that belongs to a container file."""
+    return archive_path.with_suffix(INDEX_SUFFIX)
+
+
+class _FrameScanner:
+    """Finds where the frame at the start of a buffer ends.
+
+    A frame usually arrives over several ``feed()`` calls, so scanners keep
+    their position between calls and each byte is examined once. ``reset()``
+    is called after every complete frame.
+    """
+
+    def reset(self) -> None:
+        pass
+
+    def __call__(self, buf: bytearray) -> Optional[int]:
+        """Length of the frame at the start of ``buf``, or None if incomplete."""
+        raise NotImplementedError
+
+
+class _JpegScanner(_FrameScanner):
+    """Walks JPEG marker segments, then scans entropy data for EOI."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._pos = 2
+        self._in_scan = False
+
+    def __call__(self, buf: bytearray) -> Optional[int]:
+        if len(buf) < 4:
+            return None
+        if buf[:2] != b"\xff\xd8":
+            raise ValueError("Corrupt JPEG stream: missing SOI marker")
+        pos = self._pos
+        # Walk the marker segments up to the start of scan
+        while not self._in_scan:
+            if pos + 4 > len(buf):
+                self._pos = pos
+                return None
+            if buf[pos] != 0xFF:
+                raise ValueError("Corrupt JPEG stream: expected marker")
+            marker = buf[pos + 1]
+            if marker == 0xFF:
+                pos += 1  # fill byte
+                continue
+            segment_length = struct.unpack_from(">H", buf, pos + 2)[0]
+            pos += 2 + segment_length
+            self._in_scan = marker == 0xDA
+        # Scan entropy-coded data: 0xFF is followed by 0x00 (stuffing) or RSTn
+        # everywhere except at the EOI marker
+        while True:
+            found = buf.find(b"\xff", pos)
+            if found == -1:
+                self._pos = max(pos, len(buf))
+                return None
+            if found + 1 >= len(buf):
+                self._pos = found  # re-read this 0xFF once its marker arrives
+                return None
+            marker = buf[found + 1]
+            if marker == 0xD9:
+                return found + 2
+            pos = found + (1 if marker == 0xFF else 2)
+
+
+class _PngScanner(_FrameScanner):
+    """Skips from chunk header to chunk header until IEND."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._pos = len(PNG_SIGNATURE)
+        self._end: Optional[int] = None
+
+    def __call__(self, buf: bytearray) -> Optional[int]:
+        if len(buf) < len(PNG_SIGNATURE):
+            return None
+        if buf[:len(PNG_SIGNATURE)] != PNG_SIGNATURE:
+            raise ValueError("Corrupt PNG stream: missing signature")
+        while self._end is None and self._pos + 8 <= len(buf):
+            chunk_length, chunk_type = struct.unpack_from(">I4s", buf, self._pos)
+            self._pos += 12 + chunk_length  # length, type, data, CRC
+            if chunk_type == b"IEND":
+                self._end = self._pos
+        return self._end
+
+
+class _BmpScanner(_FrameScanner):
+    """Reads the file size from the BMP header."""
+
+    def __call__(self, buf: bytearray) -> Optional[int]:
+        if len(buf) < 6:
+            return None
+        if buf[:2] != b"BM":
+            raise ValueError("Corrupt BMP stream: missing BM header")
+        return struct.unpack_from("<I", buf, 2)[0]
+
+
+class _WebpScanner(_FrameScanner):
+    """Reads the chunk size from the RIFF header."""
+
+    def __call__(self, buf: bytearray) -> Optional[int]:
+        if len(buf) < 8:
+            return None
+        if buf[:4] != b"RIFF":
+            raise ValueError("Corrupt WebP stream: missing RIFF header")
+        riff_length = struct.unpack_from("<I", buf, 4)[0]
+        return 8 + riff_length + (riff_length & 1)  # chunks are padded to even size
+
+
+_SCANNERS: Dict[str, Callable[[], _FrameScanner]] = {
+    'jpg': _JpegScanner,
+    'jpeg': _JpegScanner,
+    'png': _PngScanner,
+    'bmp': _BmpScanner,
+    'webp': _WebpScanner,
+}
+
+
+class FrameArchiveWriter:
+    """Append encoded frames to a container file and its offset index."""
+
+    def __init__(self, archive_path: str, fps: float, format: str = "jpg"):
+        self.archive_path = Path(archive_path)
+        self.index_path = index_path_for(self.archive_path)
+        self.fps = fps
+        self.format = format.lower()
+        self.frame_count = 0
+        self._offset = 0
+        self._pending = bytearray()
+
+        if self.format not in PACKED_FORMATS:
+            raise ValueError(f"Unsupported packed format: {self.format}. "
+                             f"Supported: {PACKED_FORMATS}")
+        self._scanner = _SCANNERS[self.format]()
+
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self._archive: BinaryIO = open(self.archive_path, "wb")
+        self._index: BinaryIO = open(self.index_path, "wb")
+        self._index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.fps,
+                                            self.format.encode("ascii")))
+
+    def append(self, frame: bytes) -> int:
+        """Append one encoded frame and return its 1-based frame number."""
+        timestamp = self.frame_count / self.fps
+        # Hand the frame to the OS before its index record, so a killed process
+        # leaves no record pointing past the container. The OS may still write
+        # the two files to disk in either order, so readers check bounds.
+        self._archive.write(frame)
+        self._archive.flush()
+        self._index.write(INDEX_RECORD.pack(self._offset, len(frame), timestamp))
+        self._offset += len(frame)
+        self.frame_count += 1
+        return self.frame_count
+
+    def feed(self, data: bytes) -> None:
+        """Split a raw ffmpeg image2pipe stream into frames and append them."""
+        self._pending.extend(data)
+        while True:
+            length = self._scanner(self._pending)
+            if length is None or length > len(self._pending):
+                return
+            self.append(bytes(self._pending[:length]))
+            del self._pending[:length]
+            self._scanner.reset()
+
+    def close(self) -> None:
+        """Flush and close the archive, rejecting a truncated trailing frame."""
+        self._archive.close()
+        self._index.close()
+        if self._pending:
+            raise ValueError(f"Stream ended inside a frame ({len(self._pending)} "
+                             "bytes discarded)")
+
+    def __enter__(self) -> "FrameArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep the frames written so far without masking the original error
+            self._archive.close()
+            self._index.close()
+
+
+class FrameArchive:
+    """Memory-mapped, random-access reader for a packed frame archive."""
+
+    def __init__(self, archive_path: str):
+        self.archive_path = Path(archive_path)
+        self.index_path = index_path_for(self.archive_path)
+
+        if not self.archive_path.exists():
+            raise FileNotFoundError(f"Frame archive not found: {self.archive_path}")
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"Frame index not found: {self.index_path}")
+
+        with open(self.index_path, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size:
+            raise ValueError(f"Truncated frame index: {self.index_path}")
+        magic, version, self.fps, format = INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"Not a version {INDEX_VERSION} frame index: {self.index_path}")
+        self.format = format.rstrip(b"\0").decode("ascii")
+
+        self._archive_file = open(self.archive_path, "rb")
+        self._index_file = open(self.index_path, "rb")
+        # mmap rejects empty files, which is what an archive with no frames has
+        self._archive = self._map(self._archive_file)
+        self._index = self._map(self._index_file)
+        records = (len(self._index) - INDEX_HEADER.size) // INDEX_RECORD.size
+        self.frame_count = max(0, records)
+
+    @staticmethod
+    def _map(f: BinaryIO) -> Union[mmap.mmap, bytes]:
+        if Path(f.name).stat().st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def _record(self, number: int) -> tuple:
+        if not 1 <= number <= self.frame_count:
+            raise IndexError(f"Frame {number} out of range 1-{self.frame_count}")
+        position = INDEX_HEADER.size + (number - 1) * INDEX_RECORD.size
+        return INDEX_RECORD.unpack_from(self._index, position)
+
+    def frame(self, number: int) -> bytes:
+        """Return the encoded image of a 1-based frame number."""
+        offset, length, _ = self._record(number)
+        if offset + length > len(self._archive):
+            raise ValueError(f"Frame {number} lies beyond the end of {self.archive_path.name} "
+                             "(truncated archive)")
+        return self._archive[offset:offset + length]
+
+    def timestamp(self, number: int) -> float:
+        """Return the timestamp in seconds of a 1-based frame number."""
+        return self._record(number)[2]
+
+    def number_at(self, seconds: float) -> int:
+        """Return the number of the frame shown at a timestamp."""
+        if self.frame_count == 0:
+            raise IndexError("Frame archive is empty")
+        number = math.floor(seconds * self.fps + TIMESTAMP_TOLERANCE) + 1
+        return min(max(number, 1), self.frame_count)
+
+    def frame_at(self, seconds: float) -> bytes:
+        """Return the encoded image shown at a timestamp."""
+        return self.frame(self.number_at(seconds))
+
+    def __iter__(self) -> Iterator[bytes]:
+        for number in range(1, self.frame_count + 1):
+            yield self.frame(number)
+
+    def close(self) -> None:
+        """Release the memory maps and file handles."""
+        for mapped in (self._archive, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._archive_file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "FrameArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def extract(self, numbers: List[int], output_dir: str, prefix: str = "frame") -> List[str]:
+        """Write the given frames to individual image files."""
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        written = []
+        for number in numbers:
+            path = out / f"{prefix}_{number:06d}.{self.format}"
+            path.write_bytes(self.frame(number))
+            written.append(str(path))
+        return written
+
+
+def main():
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(
+        description="Inspect a packed frame archive and extract frames on demand",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python frame_archive.py video_frame.frames
+  python frame_archive.py video_frame.frames --frame 1 --frame 250
+  python frame_archive.py video_frame.frames --time 90.5 --output-dir ./stills
+  python frame_archive.py video_frame.frames --all --prefix scene
+        """
+    )
+
+    parser.add_argument("archive", help=f"Path to a {ARCHIVE_SUFFIX} container file")
+    parser.add_argument("--frame", "-n", type=int, action="append", default=[],
+                       help="Extract this 1-based frame number (repeatable)")
+    parser.add_argument("--time", "-t", type=float, action="append", default=[],
+                       help="Extract the frame shown at this many seconds (repeatable)")
+    parser.add_argument("--all", "-a", action="store_true",
+                       help="Extract every frame in the archive")
+    parser.add_argument("--output-dir", "-o", default=".",
+                       help="Directory for extracted frames (default: current directory)")
+    parser.add_argument("--prefix", "-p", default="frame",
+                       help="Filename prefix for extracted frames (default: frame)")
+
+    args = parser.parse_args()
+
+    try:
+        with FrameArchive(args.archive) as archive:
+            print(f"📦 Archive: {archive.archive_path.name}")
+            print(f"📸 Frames: {len(archive)} {archive.format} @ {archive.fps} fps")
+
+            if args.all:
+                numbers = list(range(1, len(archive) + 1))
+            else:
+                numbers = args.frame + [archive.number_at(t) for t in args.time]
+
+            if numbers:
+                written = archive.extract(numbers, args.output_dir, args.prefix)
+                print(f"✅ Extracted {len(written)} frames to {args.output_dir}")
+    except (OSError, ValueError, IndexError) as e:
+        print(f"💥 Failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
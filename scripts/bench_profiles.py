@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-profile extraction vs separate runs
+====================================================
+
+Times one VideoFrameExtractor run producing several output profiles from a
+single decode against one run per profile, each decoding the video again.
+
+Usage:
+    python scripts/bench_profiles.py [video_file] [options]
+
+Example:
+    python scripts/bench_profiles.py movie.mp4 --fps 2 --repeat 3
+    python scripts/bench_profiles.py --duration 120   # synthetic 1080p test video
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video_frame_extractor import OutputProfile, VideoFrameExtractor  # noqa: E402
+
+DEFAULT_PROFILES = ["full:source:png", "vision:640:jpg:3", "thumb:160x90:webp"]
+
+
+def make_test_video(path: Path, duration: float) -> None:
+    """Render a synthetic 1080p H.264 clip with ffmpeg's testsrc2 source."""
+    cmd = [
+        "ffmpeg", "-y", "-f", "lavfi",
+        "-i", f"testsrc2=size=1920x1080:rate=30:duration={duration}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        str(path)
+    ]
+    subprocess.run(cmd, capture_output=True, check=True)
+
+
+def timed_run(video: Path, output_dir: Path, fps: float, profiles: list) -> float:
+    """Run one extraction quietly and return its wall-clock time."""
+    extractor = VideoFrameExtractor(str(video), fps=fps, output_dir=str(output_dir),
+                                    profiles=profiles)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = extractor.run()
+    elapsed = time.perf_counter() - start
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return elapsed
+
+
+def main():
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark multi-profile frame extraction against separate runs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("video_file", nargs="?",
+                       help="Video to benchmark (default: generate a synthetic clip)")
+    parser.add_argument("--duration", type=float, default=60,
+                       help="Length in seconds of the synthetic clip (default: 60)")
+    parser.add_argument("--fps", "-f", type=float, default=1.0,
+                       help="Frames per second to extract (default: 1.0)")
+    parser.add_argument("--profile", action="append",
+                       help=f"Profile spec, repeatable (default: {' '.join(DEFAULT_PROFILES)})")
+    parser.add_argument("--repeat", "-r", type=int, default=3,
+                       help="Number of timed repetitions (default: 3)")
+
+    args = parser.parse_args()
+    profiles = [OutputProfile.parse(spec) for spec in args.profile or DEFAULT_PROFILES]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        if args.video_file:
+            video = Path(args.video_file)
+        else:
+            video = tmp_dir / "testsrc.mp4"
+            print(f"🎞️  Generating {args.duration:.0f}s synthetic 1080p clip...")
+            make_test_video(video, args.duration)
+
+        print(f"⏱️  {video.name}: {len(profiles)} profiles at {args.fps} fps, "
+              f"{args.repeat} repetitions")
+
+        single, separate = [], []
+        for i in range(args.repeat):
+            single.append(timed_run(video, tmp_dir / f"single_{i}", args.fps, profiles))
+            separate.append(sum(
+                timed_run(video, tmp_dir / f"separate_{i}", args.fps, [profile])
+                for profile in profiles
+            ))
+
+    single_time = statistics.median(single)
+    separate_time = statistics.median(separate)
+    print(f"\n{'Mode':<28}{'Median':>10}")
+    print("-" * 38)
+    print(f"{'One run, split + scale':<28}{single_time:>9.2f}s")
+    print(f"{f'{len(profiles)} separate runs':<28}{separate_time:>9.2f}s")
+    print(f"\n🚀 Speedup: {separate_time / single_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Tests for the asyncio ffmpeg runner.
+
+A small fake ``ffmpeg`` script stands in for the real binary so progress
+parsing, error tails, timeouts and the concurrency limit can be exercised
+without any media or an ffmpeg install.
+"""
+import asyncio
+import itertools
+import stat
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from ffmpeg_runner import (
+    FFmpegProgress,
+    build_command,
+    parse_duration,
+    parse_progress_line,
+    run_ffmpeg,
+    run_ffmpeg_sync,
+    run_many,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32",
+                                reason="fake ffmpeg relies on a shebang script")
+
+FAKE_FFMPEG = """\
+#!{python}
+import sys, time
+sys.stderr.write("Input #0, mov,mp4, from 'in.mp4':\\n")
+sys.stderr.write("  Duration: 00:00:10.00, start: 0.000000, bitrate: 100 kb/s\\n")
+for i in range(1, 3):
+    print(f"frame={{i * 25}}\\nfps=50.0\\nout_time_us={{i * 5_000_000}}")
+    print(f"total_size={{i * 1024}}\\nspeed=2.5x")
+    print("progress=" + ("end" if i == 2 else "continue"), flush=True)
+for i in range({stderr_lines}):
+    sys.stderr.write(f"log line {{i}}\\n")
+time.sleep({sleep})
+if {marker!r}:
+    open({marker!r}, "w").close()
+sys.exit({exit_code})
+"""
+
+# Media on stdout, progress interleaved with log lines on stderr, as with
+# -progress pipe:2
+FAKE_FFMPEG_PIPE = """\
+#!{python}
+import sys
+sys.stderr.write("  Duration: 00:00:04.00, start: 0.000000, bitrate: 100 kb/s\\n")
+for i in range(1, 3):
+    sys.stdout.buffer.write(bytes(range(256)) * 100)
+    sys.stdout.buffer.flush()
+    sys.stderr.write(f"[image2pipe] log line {{i}}\\n")
+    sys.stderr.write(f"frame={{i}}\\nout_time_us={{i * 2_000_000}}\\nspeed=1.0x\\n")
+    sys.stderr.write("progress=" + ("end" if i == 2 else "continue") + "\\n")
+    sys.stderr.flush()
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    scripts = itertools.count()
+
+    def make(exit_code=0, sleep=0, stderr_lines=0, marker=""):
+        script = tmp_path / f"ffmpeg{next(scripts)}"
+        script.write_text(FAKE_FFMPEG.format(python=sys.executable, exit_code=exit_code,
+                                             sleep=sleep, stderr_lines=stderr_lines,
+                                             marker=str(marker)))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return [str(script), "-i", "in.mp4", "out.wav"]
+    return make
+
+
+def test_parse_progress_block():
+    progress = FFmpegProgress(duration=20.0)
+    lines = textwrap.dedent("""\
+        frame=120
+        fps=60.0
+        out_time_us=5000000
+        total_size=N/A
+        speed=2x
+    """).splitlines()
+    assert not any(parse_progress_line(line, progress) for line in lines)
+    assert parse_progress_line("progress=continue", progress)
+    assert progress.frame == 120
+    assert progress.out_time == 5.0
+    assert progress.total_size == 0
+    assert progress.percent == 25.0
+    assert progress.eta == 7.5
+    assert not progress.done
+
+
+def test_parse_duration():
+    assert parse_duration("  Duration: 01:02:03.50, start: 0.0") == 3723.5
+    assert parse_duration("Stream #0:0: Video: h264") is None
+
+
+def test_build_command_puts_progress_options_first():
+    cmd = build_command(["ffmpeg", "-i", "in.mp4", "out.wav"])
+    assert cmd[0] == "ffmpeg"
+    assert cmd[-3:] == ["-i", "in.mp4", "out.wav"]
+    assert "pipe:1" in cmd
+    assert build_command(["ffmpeg"], progress_pipe=2)[-1] == "pipe:2"
+
+
+def test_run_reports_progress(fake_ffmpeg):
+    reports = []
+    result = run_ffmpeg_sync(fake_ffmpeg(),
+                             on_progress=lambda p: reports.append((p.percent, p.done)))
+    assert reports == [(50.0, False), (100.0, True)]
+    assert result['returncode'] == 0
+    assert result['progress'].duration == 10.0
+
+
+def test_sync_wrapper_works_inside_running_loop(fake_ffmpeg):
+    async def scenario():
+        return run_ffmpeg_sync(fake_ffmpeg())
+
+    assert asyncio.run(scenario())['returncode'] == 0
+
+
+def test_failure_keeps_bounded_stderr_tail(fake_ffmpeg):
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        run_ffmpeg_sync(fake_ffmpeg(exit_code=1, stderr_lines=500), stderr_lines=10)
+    tail = exc_info.value.stderr.splitlines()
+    assert exc_info.value.returncode == 1
+    assert len(tail) == 10
+    assert tail[-1] == "log line 499"
+
+
+def test_timeout_stops_ffmpeg(fake_ffmpeg):
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_ffmpeg_sync(fake_ffmpeg(sleep=30), timeout=0.5)
+
+
+def test_cancellation_stops_ffmpeg(fake_ffmpeg):
+    async def scenario():
+        task = asyncio.ensure_future(run_ffmpeg(fake_ffmpeg(sleep=30)))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+
+def test_callback_error_stops_ffmpeg(fake_ffmpeg, tmp_path):
+    marker = tmp_path / "finished"
+
+    def reject(chunk):
+        raise ValueError("corrupt stream")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await run_ffmpeg(fake_ffmpeg(sleep=1, marker=marker), on_stdout=reject)
+        await asyncio.sleep(1.5)
+
+    asyncio.run(scenario())
+    assert not marker.exists()
+
+
+def test_run_many_respects_concurrency(fake_ffmpeg, monkeypatch):
+    import ffmpeg_runner
+
+    running = 0
+    peak = 0
+    original = ffmpeg_runner.run_ffmpeg
+
+    async def tracking_run(cmd, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await original(cmd, **kwargs)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(ffmpeg_runner, "run_ffmpeg", tracking_run)
+    commands = [fake_ffmpeg(sleep=0.2)] * 5
+    results = asyncio.run(run_many(commands, concurrency=2))
+    assert len(results) == 5
+    assert peak == 2
+
+
+def test_run_many_failure_stops_other_jobs(fake_ffmpeg, tmp_path):
+    finished = [tmp_path / f"finished{i}" for i in range(2)]
+    commands = [fake_ffmpeg(sleep=1, marker=marker) for marker in finished]
+    commands.append(fake_ffmpeg(exit_code=1))
+
+    async def scenario():
+        start = time.monotonic()
+        with pytest.raises(subprocess.CalledProcessError):
+            await run_many(commands, concurrency=3)
+        assert time.monotonic() - start < 1
+        # Keep the loop alive: asyncio.run() would otherwise cancel leftover
+        # tasks on shutdown and hide siblings that were never stopped
+        await asyncio.sleep(1.5)
+
+    asyncio.run(scenario())
+    assert not any(marker.exists() for marker in finished)
+
+
+def test_run_many_return_exceptions_lets_others_finish(fake_ffmpeg, tmp_path):
+    marker = tmp_path / "finished"
+    commands = [fake_ffmpeg(sleep=0.5, marker=marker), fake_ffmpeg(exit_code=1)]
+    results = asyncio.run(run_many(commands, return_exceptions=True))
+    assert results[0]['returncode'] == 0
+    assert isinstance(results[1], subprocess.CalledProcessError)
+    assert marker.exists()
+
+
+def test_stdout_media_is_streamed(tmp_path):
+    script = tmp_path / "ffmpeg"
+    script.write_text(FAKE_FFMPEG_PIPE.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    chunks = []
+    reports = []
+    result = run_ffmpeg_sync([str(script), "-i", "in.mp4", "-f", "image2pipe", "pipe:1"],
+                             on_stdout=chunks.append,
+                             on_progress=lambda p: reports.append((p.frame, p.percent, p.done)))
+
+    assert b"".join(chunks) == bytes(range(256)) * 200
+    assert reports == [(1, 50.0, False), (2, 100.0, True)]
+    assert result['progress'].duration == 4.0
+    tail = result['stderr'].splitlines()
+    assert "[image2pipe] log line 2" in tail
+    assert not any(line.startswith(("frame=", "out_time_us=", "progress=")) for line in tail)
@@ -0,0 +1,144 @@
+"""Tests for the packed frame archive.
+
+Frames are synthetic byte strings with valid JPEG/PNG framing, so the stream
+splitter and the random-access index can be checked without ffmpeg.
+"""
+import random
+import struct
+from pathlib import Path
+
+import pytest
+
+from frame_archive import FrameArchive, FrameArchiveWriter, index_path_for
+
+
+def fake_jpeg(payload: bytes) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 6) + b"\xff\xd9JF"  # EOI bytes inside a segment
+    sos = b"\xff\xda" + struct.pack(">H", 4) + b"\x01\x02"
+    entropy = payload + b"\xff\x00" + b"\xff\xd3" + payload  # stuffing and a restart marker
+    return b"\xff\xd8" + app0 + sos + entropy + b"\xff\xd9"
+
+
+def fake_png(payload: bytes) -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + b"\0\0\0\0"
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", payload) + chunk(b"IEND", b"")
+
+
+def feed_in_chunks(writer: FrameArchiveWriter, stream: bytes, size: int = 7) -> None:
+    for start in range(0, len(stream), size):
+        writer.feed(stream[start:start + size])
+
+
+@pytest.mark.parametrize("format, make_frame", [("jpg", fake_jpeg), ("png", fake_png)])
+def test_stream_round_trip(tmp_path, format, make_frame):
+    frames = [make_frame(bytes([i]) * (i + 3)) for i in range(5)]
+    archive_path = tmp_path / "video_frame.frames"
+
+    with FrameArchiveWriter(str(archive_path), fps=2.0, format=format) as writer:
+        feed_in_chunks(writer, b"".join(frames))
+    assert writer.frame_count == 5
+    assert archive_path.read_bytes() == b"".join(frames)
+
+    with FrameArchive(str(archive_path)) as archive:
+        assert len(archive) == 5
+        assert archive.format == format
+        assert archive.frame(1) == frames[0]
+        assert archive.frame(5) == frames[4]
+        assert list(archive) == frames
+        assert archive.timestamp(3) == 1.0
+        assert archive.frame_at(1.9) == frames[3]
+        assert archive.number_at(100.0) == 5
+
+
+@pytest.mark.parametrize("fps", [7, 23.976, 29.97, 30, 60])
+def test_timestamp_lookup_matches_stored_timestamps(tmp_path, fps):
+    archive_path = tmp_path / "video_frame.frames"
+    with FrameArchiveWriter(str(archive_path), fps=fps) as writer:
+        for _ in range(10 * 60 * 60):  # ten minutes at 60 fps
+            writer.append(b"x")
+
+    with FrameArchive(str(archive_path)) as archive:
+        for number in range(1, len(archive) + 1):
+            assert archive.number_at(archive.timestamp(number)) == number
+        assert archive.number_at(archive.timestamp(124) - 0.5 / fps) == 123
+
+
+def test_large_frame_fed_in_chunks_is_scanned_once(tmp_path):
+    # Random entropy data with every 0xFF byte-stuffed, as a JPEG encoder emits it
+    payload = random.Random(0).randbytes(3 * 1024 * 1024).replace(b"\xff", b"\xff\x00")
+    frames = [fake_jpeg(payload), fake_jpeg(b"next")]
+    stream = b"".join(frames)
+    chunk_size = 64 * 1024
+
+    with FrameArchiveWriter(str(tmp_path / "video_frame.frames"), fps=1.0) as writer:
+        for start in range(0, len(stream), chunk_size):
+            writer.feed(stream[start:start + chunk_size])
+            if writer.frame_count == 0:
+                # The scan resumes at the end of the buffered data, not at byte 0
+                assert writer._scanner._pos >= len(writer._pending) - 1
+
+    with FrameArchive(str(tmp_path / "video_frame.frames")) as archive:
+        assert list(archive) == frames
+
+
+def test_frame_number_out_of_range(tmp_path):
+    archive_path = tmp_path / "video_frame.frames"
+    with FrameArchiveWriter(str(archive_path), fps=1.0) as writer:
+        writer.append(fake_jpeg(b"x"))
+
+    with FrameArchive(str(archive_path)) as archive:
+        with pytest.raises(IndexError):
+            archive.frame(0)
+        with pytest.raises(IndexError):
+            archive.frame(2)
+
+
+def test_truncated_container_is_detected(tmp_path):
+    archive_path = tmp_path / "video_frame.frames"
+    frames = [fake_jpeg(b"x"), fake_jpeg(b"y")]
+    with FrameArchiveWriter(str(archive_path), fps=1.0) as writer:
+        for frame in frames:
+            writer.append(frame)
+    archive_path.write_bytes(archive_path.read_bytes()[:-1])
+
+    with FrameArchive(str(archive_path)) as archive:
+        assert archive.frame(1) == frames[0]
+        with pytest.raises(ValueError):
+            archive.frame(2)
+
+
+def test_empty_archive(tmp_path):
+    archive_path = tmp_path / "video_frame.frames"
+    FrameArchiveWriter(str(archive_path), fps=1.0).close()
+
+    with FrameArchive(str(archive_path)) as archive:
+        assert len(archive) == 0
+        assert list(archive) == []
+
+
+def test_truncated_stream_is_rejected(tmp_path):
+    writer = FrameArchiveWriter(str(tmp_path / "video_frame.frames"), fps=1.0)
+    writer.feed(fake_jpeg(b"x") + fake_jpeg(b"y")[:-3])
+    with pytest.raises(ValueError):
+        writer.close()
+    assert writer.frame_count == 1
+
+
+def test_extract_writes_individual_files(tmp_path):
+    archive_path = tmp_path / "video_frame.frames"
+    frames = [fake_png(bytes([i])) for i in range(3)]
+    with FrameArchiveWriter(str(archive_path), fps=1.0, format="png") as writer:
+        for frame in frames:
+            writer.append(frame)
+
+    with FrameArchive(str(archive_path)) as archive:
+        written = archive.extract([2], str(tmp_path / "stills"))
+    assert [Path(p).name for p in written] == ["frame_000002.png"]
+    assert (tmp_path / "stills" / "frame_000002.png").read_bytes() == frames[1]
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        FrameArchiveWriter(str(tmp_path / "video_frame.frames"), fps=1.0, format="tiff")
+    assert not index_path_for(tmp_path / "video_frame.frames").exists()
@@ -0,0 +1,92 @@
+"""Tests for multi-resolution output profiles.
+
+Only profile parsing and the generated ffmpeg command are checked, so no
+media or ffmpeg install is needed.
+"""
+import pytest
+
+from video_frame_extractor import OutputProfile, VideoFrameExtractor, quality_args
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("full", ("full", None, None, "jpg", 2)),
+    ("full:source:png", ("full", None, None, "png", 2)),
+    ("vision:640", ("vision", 640, None, "jpg", 2)),
+    ("tall:x720", ("tall", None, 720, "jpg", 2)),
+    ("thumb:160x90:webp:5", ("thumb", 160, 90, "webp", 5)),
+])
+def test_parse_profile(spec, expected):
+    profile = OutputProfile.parse(spec)
+    assert (profile.name, profile.width, profile.height,
+            profile.format, profile.quality) == expected
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("", "profile name"),
+    ("a/b:640", "profile name"),
+    ("thumb:wide", "size"),
+    ("thumb:160:gif", "format"),
+    ("a:1:jpg:2:x", "expected"),
+    ("thumb:160:jpg:0", "quality"),
+    ("thumb:160:jpg:-5", "quality"),
+    ("thumb:160:jpg:11", "quality"),
+    ("thumb:160:jpg:abc", "quality"),
+    ("raw:source:bmp:3", "no quality"),
+    ("raw:source:tiff:1", "no quality"),
+])
+def test_parse_invalid_profile(spec, message):
+    with pytest.raises(ValueError, match=message):
+        OutputProfile.parse(spec)
+
+
+def test_profiles_share_one_decode(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    profiles = [OutputProfile.parse(spec) for spec in
+                ["full:source:png", "vision:640", "thumb:160x90:webp"]]
+    extractor = VideoFrameExtractor(str(video), fps=2, output_dir=str(tmp_path / "out"),
+                                    profiles=profiles)
+
+    cmd = extractor.build_profiles_command()
+
+    assert cmd.count("-i") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph.startswith("[0:v]fps=2,split=3[s0][s1][s2]")
+    assert "[s1]scale=640:-2[o1]" in graph
+    assert cmd.count("-map") == 3
+    assert cmd[cmd.index("-map") + 1] == "[s0]"
+    assert cmd[-1].endswith("thumb/clip_frame_%04d.webp")
+    # One still image per frame, not a single animated WebP
+    assert cmd[-5:-1] == ["-c:v", "libwebp", "-f", "image2"]
+
+
+@pytest.mark.parametrize("format, quality, expected", [
+    ("jpg", 3, ["-q:v", "3"]),
+    ("png", 2, ["-compression_level", "6"]),
+    ("webp", 1, ["-quality", "100"]),
+    ("webp", 10, ["-quality", "10"]),
+    ("bmp", 2, []),
+])
+def test_quality_args(format, quality, expected):
+    assert quality_args(format, quality) == expected
+
+
+def test_webp_profile_quality_reaches_ffmpeg(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    profiles = [OutputProfile.parse("best:320:webp:1"), OutputProfile.parse("small:320:webp:10")]
+    extractor = VideoFrameExtractor(str(video), output_dir=str(tmp_path / "out"),
+                                    profiles=profiles)
+
+    cmd = extractor.build_profiles_command()
+
+    qualities = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-quality"]
+    assert qualities == ["100", "10"]
+
+
+def test_duplicate_profile_names_rejected(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    with pytest.raises(ValueError):
+        VideoFrameExtractor(str(video), output_dir=str(tmp_path),
+                            profiles=[OutputProfile("a"), OutputProfile("a", 100)])
@@ -28,3 +28,9 @@ def test_frame_extractor_help_exits_clean():
     result = _run_help("video_frame_extractor.py")
     assert result.returncode == 0
     assert "usage" in result.stdout.lower()
+
+
+def test_profile_benchmark_help_exits_clean():
+    result = _run_help("scripts/bench_profiles.py")
+    assert result.returncode == 0
+    assert "usage" in result.stdout.lower()
@@ -10,26 +10,142 @@ Usage:
 
 Example:
     python video_frame_extractor.py video.mp4 --fps 2 --format png
+    python video_frame_extractor.py video.mp4 --fps 10 --packed
+    python video_frame_extractor.py video.mp4 --profile full:source:png --profile thumb:160x90
 """
 
 import argparse
 import subprocess
 import sys
 import math
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+from ffmpeg_runner import print_progress, run_ffmpeg_sync
+from frame_archive import ARCHIVE_SUFFIX, PACKED_FORMATS, FrameArchiveWriter
+
+SUPPORTED_FORMATS = ['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'webp']
+
+# Still-image encoder for each format. libwebp is named explicitly because
+# ffmpeg defaults to libwebp_anim, which merges all frames into one image.
+IMAGE_CODECS = {'jpg': 'mjpeg', 'jpeg': 'mjpeg', 'png': 'png', 'bmp': 'bmp',
+                'tiff': 'tiff', 'webp': 'libwebp'}
+
+# Accepted range for --quality and per-profile quality
+MIN_QUALITY = 1
+MAX_QUALITY = 10
+
+# Formats written without any quality or compression setting
+LOSSLESS_FORMATS = ['bmp', 'tiff']
+
+
+@dataclass
+class OutputProfile:
+    """One output rendition: its own size, image format and quality.
+
+    A missing width or height is derived from the source aspect ratio; with
+    neither set, frames keep the source resolution. Frames are written to a
+    subdirectory named after the profile.
+    """
+
+    name: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: str = "jpg"
+    quality: int = 2
+
+    def __post_init__(self):
+        self.format = self.format.lower()
+        if not self.name or not self.name.replace("-", "").replace("_", "").isalnum():
+            raise ValueError(f"Invalid profile name: {self.name!r} (use letters, digits, - and _)")
+        if self.format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {self.format}. Supported: {SUPPORTED_FORMATS}")
+        for size in (self.width, self.height):
+            if size is not None and size <= 0:
+                raise ValueError(f"Profile {self.name}: size must be greater than 0")
+        if not MIN_QUALITY <= self.quality <= MAX_QUALITY:
+            raise ValueError(f"Profile {self.name}: quality must be between "
+                             f"{MIN_QUALITY} and {MAX_QUALITY}")
+
+    @classmethod
+    def parse(cls, spec: str, format: str = "jpg", quality: int = 2) -> "OutputProfile":
+        """Parse ``name[:size[:format[:quality]]]``, e.g. ``thumb:160x90:webp:3``.
+
+        ``size`` is ``WIDTH``, ``WIDTHxHEIGHT``, ``xHEIGHT`` or ``source``.
+        Omitted fields fall back to the given format and quality.
+        """
+        parts = spec.split(":")
+        if len(parts) > 4:
+            raise ValueError(f"Invalid profile: {spec!r} (expected name[:size[:format[:quality]]])")
+        name = parts[0]
+        size = parts[1] if len(parts) > 1 else ""
+        if len(parts) > 2 and parts[2]:
+            format = parts[2]
+        if len(parts) > 3 and parts[3]:
+            if format.lower() in LOSSLESS_FORMATS:
+                raise ValueError(f"Invalid profile: {spec!r} ({format} has no quality setting)")
+            try:
+                quality = int(parts[3])
+            except ValueError:
+                raise ValueError(f"Invalid profile: {spec!r} (quality must be a whole number)")
+        try:
+            width = height = None
+            if size and size != "source":
+                w, _, h = size.lower().partition("x")
+                width = int(w) if w else None
+                height = int(h) if h else None
+        except ValueError:
+            raise ValueError(f"Invalid profile: {spec!r} (size must be like 640, 640x360 or x360)")
+        return cls(name, width, height, format, quality)
+
+    def scale_filter(self) -> Optional[str]:
+        """Return the scale filter for this profile, or None for source size."""
+        if self.width and self.height:
+            # Fit inside the box without distorting the picture
+            return (f"scale={self.width}:{self.height}"
+                    ":force_original_aspect_ratio=decrease:force_divisible_by=2")
+        if self.width:
+            return f"scale={self.width}:-2"
+        if self.height:
+            return f"scale=-2:{self.height}"
+        return None
+
+
+def quality_args(format: str, quality: int) -> List[str]:
+    """Return the ffmpeg encoder options for an image format and quality."""
+    if format in ['jpg', 'jpeg']:
+        # JPEG quality: 1 (best) to 31 (worst)
+        return ["-q:v", str(quality)]
+    if format == 'png':
+        # PNG compression: 0 (no compression) to 9 (max compression)
+        return ["-compression_level", str(min(9, quality * 3))]
+    if format == 'webp':
+        # libwebp quality: 100 (best) to 0 (worst); map 1..10 onto 100..10
+        return ["-quality", str(100 - (quality - 1) * 10)]
+    return []
+
+
+def image_sequence_args(format: str) -> List[str]:
+    """Return the ffmpeg options that write one image file per frame."""
+    return ["-c:v", IMAGE_CODECS[format], "-f", "image2"]
 
 
 class VideoFrameExtractor:
     """Main class for video frame extraction workflow."""
 
     def __init__(self, video_path: str, fps: float = 1.0, output_dir: Optional[str] = None,
-                 format: str = "jpg", quality: int = 2, prefix: str = "frame"):
+                 format: str = "jpg", quality: int = 2, prefix: str = "frame",
+                 timeout: Optional[float] = None, packed: bool = False,
+                 profiles: Optional[List[OutputProfile]] = None):
         self.video_path = Path(video_path)
         self.fps = fps
         self.format = format.lower()
         self.quality = quality
         self.prefix = prefix
+        self.timeout = timeout
+        self.packed = packed
+        self.profiles = profiles or []
 
         # Validate input file
         if not self.video_path.exists():
@@ -47,9 +163,22 @@ class VideoFrameExtractor:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         # Validate format
-        supported_formats = ['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'webp']
-        if self.format not in supported_formats:
-            raise ValueError(f"Unsupported format: {self.format}. Supported: {supported_formats}")
+        if self.format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {self.format}. Supported: {SUPPORTED_FORMATS}")
+        if self.packed and self.format not in PACKED_FORMATS:
+            raise ValueError(f"Format {self.format} cannot be packed. Supported: {PACKED_FORMATS}")
+
+        # Validate profiles
+        if self.profiles and self.packed:
+            raise ValueError("Packed output does not support multiple profiles")
+        names = [profile.name for profile in self.profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Profile names must be unique: {names}")
+
+    @property
+    def archive_path(self) -> Path:
+        """Container file used when frames are packed into one archive."""
+        return self.output_dir / f"{self.video_path.stem}_{self.prefix}{ARCHIVE_SUFFIX}"
 
     def check_ffmpeg(self) -> bool:
         """Check if ffmpeg is available in system PATH."""
@@ -131,7 +260,10 @@ class VideoFrameExtractor:
                     print(f"📐 Resolution: {video_info['width']}x{video_info['height']}")
         except Exception as e:
             print(f"⚠️  Could not get video info: {e}")
-            video_info = {'estimated_frames': 0}
+            video_info = {'duration': 0, 'estimated_frames': 0}
+
+        if self.profiles:
+            return self._extract_profiles(video_info)
 
         # Build output filename pattern with video name included
         video_name = self.video_path.stem
@@ -146,19 +278,18 @@ class VideoFrameExtractor:
         ]
 
         # Add quality settings based on format
-        if self.format in ['jpg', 'jpeg']:
-            # JPEG quality: 1 (best) to 31 (worst)
-            cmd.extend(["-q:v", str(self.quality)])
-        elif self.format == 'png':
-            # PNG compression: 0 (no compression) to 9 (max compression)
-            cmd.extend(["-compression_level", str(min(9, self.quality * 3))])
+        cmd.extend(quality_args(self.format, self.quality))
 
-        cmd.append(str(output_pattern))
+        if self.packed:
+            return self._extract_packed(cmd, video_info)
+
+        cmd.extend([*image_sequence_args(self.format), str(output_pattern)])
 
         try:
             print("🔄 Extracting frames...")
-            # Run ffmpeg with progress
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Run ffmpeg with live progress; duration lets the runner show an ETA
+            run_ffmpeg_sync(cmd, duration=video_info['duration'] or None,
+                            on_progress=print_progress, timeout=self.timeout)
 
             # Count extracted frames
             video_name = self.video_path.stem
@@ -180,32 +311,148 @@ class VideoFrameExtractor:
         except subprocess.CalledProcessError as e:
             print(f"❌ FFmpeg error: {e.stderr}")
             raise RuntimeError(f"Failed to extract frames: {e}")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Frame extraction timed out after {self.timeout} seconds")
+
+    def _extract_packed(self, cmd: list, video_info: dict) -> dict:
+        """Stream frames from ffmpeg straight into a packed frame archive."""
+        # Encoded images are written back to back on stdout
+        cmd.extend(["-f", "image2pipe", "-c:v", IMAGE_CODECS[self.format], "pipe:1"])
+
+        try:
+            print("🔄 Extracting frames into archive...")
+            with FrameArchiveWriter(str(self.archive_path), self.fps, self.format) as writer:
+                run_ffmpeg_sync(cmd, duration=video_info['duration'] or None,
+                                on_progress=print_progress, timeout=self.timeout,
+                                on_stdout=writer.feed)
+
+            print(f"✅ Packed {writer.frame_count} frames")
+            print(f"📦 Archive: {writer.archive_path}")
+
+            return {
+                'success': True,
+                'frames_extracted': writer.frame_count,
+                'output_directory': str(self.output_dir),
+                'format': self.format,
+                'fps': self.fps,
+                'archive': str(writer.archive_path),
+                'index': str(writer.index_path),
+                'files': [str(writer.archive_path)]
+            }
+
+        except subprocess.CalledProcessError as e:
+            print(f"❌ FFmpeg error: {e.stderr}")
+            raise RuntimeError(f"Failed to extract frames: {e}")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Frame extraction timed out after {self.timeout} seconds")
+
+    def build_profiles_command(self) -> list:
+        """Build one ffmpeg command producing every profile from a single decode.
+
+        The video is decoded and rate-limited once, then ``split`` fans the
+        frames out to one ``scale`` branch per profile.
+        """
+        video_name = self.video_path.stem
+        count = len(self.profiles)
+        labels = "".join(f"[s{i}]" for i in range(count))
+        graph = [f"[0:v]fps={self.fps},split={count}{labels}"]
+
+        outputs = []
+        for i, profile in enumerate(self.profiles):
+            scale = profile.scale_filter()
+            label = f"[s{i}]"
+            if scale:
+                graph.append(f"[s{i}]{scale}[o{i}]")
+                label = f"[o{i}]"
+            pattern = self.output_dir / profile.name / f"{video_name}_{self.prefix}_%04d.{profile.format}"
+            outputs += ["-map", label, *quality_args(profile.format, profile.quality),
+                        *image_sequence_args(profile.format), str(pattern)]
+
+        return [
+            "ffmpeg",
+            "-i", str(self.video_path),
+            "-filter_complex", ";".join(graph),
+            "-y",  # Overwrite existing files
+            *outputs,
+        ]
+
+    def _extract_profiles(self, video_info: dict) -> dict:
+        """Extract frames for every output profile in one ffmpeg run."""
+        video_name = self.video_path.stem
+        for profile in self.profiles:
+            (self.output_dir / profile.name).mkdir(parents=True, exist_ok=True)
+
+        try:
+            print(f"🔄 Extracting frames for {len(self.profiles)} profiles...")
+            run_ffmpeg_sync(self.build_profiles_command(), duration=video_info['duration'] or None,
+                            on_progress=print_progress, timeout=self.timeout)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ FFmpeg error: {e.stderr}")
+            raise RuntimeError(f"Failed to extract frames: {e}")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Frame extraction timed out after {self.timeout} seconds")
+
+        profiles = {}
+        for profile in self.profiles:
+            profile_dir = self.output_dir / profile.name
+            extracted_files = sorted(profile_dir.glob(f"{video_name}_{self.prefix}_*.{profile.format}"))
+            print(f"✅ {profile.name}: {len(extracted_files)} frames in {profile_dir}")
+            profiles[profile.name] = {
+                'frames_extracted': len(extracted_files),
+                'output_directory': str(profile_dir),
+                'format': profile.format,
+                'files': [str(f) for f in extracted_files[:5]]  # Show first 5 files
+            }
 
-    def create_contact_sheet(self, columns: int = 4) -> Optional[str]:
+        first = profiles[self.profiles[0].name]
+        return {
+            'success': True,
+            'frames_extracted': first['frames_extracted'],
+            'output_directory': str(self.output_dir),
+            'format': first['format'],
+            'fps': self.fps,
+            'files': first['files'],
+            'profiles': profiles
+        }
+
+    def create_contact_sheet(self, columns: int = 4, frame_count: Optional[int] = None) -> Optional[str]:
         """Create a contact sheet/montage of extracted frames."""
         video_name = self.video_path.stem
-        extracted_files = list(self.output_dir.glob(f"{video_name}_{self.prefix}_*.{self.format}"))
+        frames_dir = self.output_dir
+        format = self.format
+        if self.profiles:
+            # Tile the frames of the first profile
+            frames_dir = self.output_dir / self.profiles[0].name
+            format = self.profiles[0].format
+
+        if self.packed:
+            # The container is a plain image stream that ffmpeg reads directly
+            count = frame_count or 0
+            frame_input = ["-f", "image2pipe", "-i", str(self.archive_path)]
+        else:
+            extracted_files = list(frames_dir.glob(f"{video_name}_{self.prefix}_*.{format}"))
+            count = len(extracted_files)
+            frame_input = [
+                "-pattern_type", "glob",
+                "-i", str(frames_dir / f"{video_name}_{self.prefix}_*.{format}"),
+            ]
 
-        if len(extracted_files) < 2:
+        if count < 2:
             print("⚠️  Need at least 2 frames to create contact sheet")
             return None
 
-        print(f"📋 Creating contact sheet with {len(extracted_files)} frames...")
-
-        # Sort files by name to maintain order
-        extracted_files.sort()
+        print(f"📋 Creating contact sheet with {count} frames...")
 
         # Calculate rows needed
-        rows = math.ceil(len(extracted_files) / columns)
+        rows = math.ceil(count / columns)
 
-        contact_sheet_path = self.output_dir / f"contact_sheet_{self.video_path.stem}.{self.format}"
+        contact_sheet_path = self.output_dir / f"contact_sheet_{self.video_path.stem}.{format}"
 
         # Build montage command
         cmd = [
             "ffmpeg",
             "-y",  # Overwrite
-            "-pattern_type", "glob",
-            "-i", str(self.output_dir / f"{video_name}_{self.prefix}_*.{self.format}"),
+            *frame_input,
             "-filter_complex", f"tile={columns}x{rows}:margin=10:padding=5",
             str(contact_sheet_path)
         ]
@@ -226,7 +473,7 @@ class VideoFrameExtractor:
 
             # Create contact sheet if requested
             if create_contact and result['frames_extracted'] > 1:
-                contact_sheet = self.create_contact_sheet()
+                contact_sheet = self.create_contact_sheet(frame_count=result['frames_extracted'])
                 result['contact_sheet'] = contact_sheet
 
             return result
@@ -250,6 +497,8 @@ Examples:
   python video_frame_extractor.py video.mp4 --fps 2 --format png
   python video_frame_extractor.py video.mp4 --fps 0.5 --output-dir ./frames --contact-sheet
   python video_frame_extractor.py video.mp4 --fps 1 --quality 1 --prefix scene
+  python video_frame_extractor.py video.mp4 --fps 10 --packed
+  python video_frame_extractor.py video.mp4 --profile full:source:png --profile vision:640 --profile thumb:160x90:webp
         """
     )
 
@@ -267,6 +516,14 @@ Examples:
                        help="Filename prefix for extracted frames (default: frame)")
     parser.add_argument("--contact-sheet", "-c", action="store_true",
                        help="Create a contact sheet/montage of all frames")
+    parser.add_argument("--packed", action="store_true",
+                       help="Pack all frames into one archive with an offset index instead of one file per frame")
+    parser.add_argument("--profile", action="append", default=[], metavar="NAME[:SIZE[:FORMAT[:QUALITY]]]",
+                       help="Add an output profile; repeat to produce several sizes from one decode. "
+                            "SIZE is WIDTH, WIDTHxHEIGHT, xHEIGHT or source (default: --format/--quality). "
+                            "bmp and tiff take no QUALITY")
+    parser.add_argument("--timeout", "-t", type=float,
+                       help="Abort ffmpeg after this many seconds (default: no limit)")
 
     args = parser.parse_args()
 
@@ -276,21 +533,26 @@ Examples:
         sys.exit(1)
 
     # Validate quality
-    if not 1 <= args.quality <= 10:
-        print("❌ Quality must be between 1 and 10")
+    if not MIN_QUALITY <= args.quality <= MAX_QUALITY:
+        print(f"❌ Quality must be between {MIN_QUALITY} and {MAX_QUALITY}")
         sys.exit(1)
 
     print("🎬 Video Frame Extractor")
     print("=" * 40)
 
     try:
+        profiles = [OutputProfile.parse(spec, args.format, args.quality) for spec in args.profile]
+
         extractor = VideoFrameExtractor(
             video_path=args.video_file,
             fps=args.fps,
             output_dir=args.output_dir,
             format=args.format,
             quality=args.quality,
-            prefix=args.prefix
+            prefix=args.prefix,
+            timeout=args.timeout,
+            packed=args.packed,
+            profiles=profiles
         )
 
         result = extractor.run(create_contact=args.contact_sheet)
@@ -300,7 +562,14 @@ Examples:
             print(f"📸 Frames extracted: {result['frames_extracted']}")
             print(f"📁 Output directory: {result['output_directory']}")
 
-            if result['frames_extracted'] > 0:
+            for name, profile in result.get('profiles', {}).items():
+                print(f"  • {name}: {profile['frames_extracted']} {profile['format']} frames "
+                      f"in {profile['output_directory']}")
+
+            if 'archive' in result:
+                print(f"📦 Archive: {Path(result['archive']).name}")
+                print(f"🔎 Extract frames with: python frame_archive.py {result['archive']} --frame N")
+            elif result['frames_extracted'] > 0:
                 print("\n📋 Sample files:")
                 for file in result.get('files', [])[:3]:
                     print(f"  • {Path(file).name}")
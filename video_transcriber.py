@@ -18,6 +18,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from ffmpeg_runner import print_progress, run_ffmpeg_sync
+
 try:
     import whisper
 except ImportError:
@@ -30,12 +32,14 @@ class VideoTranscriber:
     """Main class for video transcription workflow."""
 
     def __init__(self, video_path: str, language: str = "auto", model: str = "small",
-                 output_dir: Optional[str] = None, keep_audio: bool = True):
+                 output_dir: Optional[str] = None, keep_audio: bool = True,
+                 timeout: Optional[float] = None):
         self.video_path = Path(video_path)
         self.language = language
         self.model = model
         self.output_dir = Path(output_dir) if output_dir else self.video_path.parent
         self.keep_audio = keep_audio
+        self.timeout = timeout
 
         # Validate input file
         if not self.video_path.exists():
@@ -75,14 +79,16 @@ class VideoTranscriber:
         ]
 
         try:
-            # Run ffmpeg with minimal output
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Run ffmpeg with live progress; only a short stderr tail is kept
+            run_ffmpeg_sync(cmd, on_progress=print_progress, timeout=self.timeout)
             print(f"✅ Audio extracted to: {self.audio_path}")
             return str(self.audio_path)
 
         except subprocess.CalledProcessError as e:
             print(f"❌ FFmpeg error: {e.stderr}")
             raise RuntimeError(f"Failed to extract audio: {e}")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Audio extraction timed out after {self.timeout} seconds")
 
     def transcribe_audio(self, audio_path: str) -> dict:
         """Transcribe audio using Whisper."""
@@ -240,6 +246,8 @@ Examples:
                        help="Delete extracted audio file after transcription")
     parser.add_argument("--keep-audio", "-k", action="store_true",
                        help="Keep extracted audio file (default behavior)")
+    parser.add_argument("--timeout", "-t", type=float,
+                       help="Abort audio extraction after this many seconds (default: no limit)")
 
     args = parser.parse_args()
 
@@ -255,7 +263,8 @@ Examples:
             language=args.language,
             model=args.model,
             output_dir=args.output_dir,
-            keep_audio=keep_audio
+            keep_audio=keep_audio,
+            timeout=args.timeout
         )
 
         result = transcriber.run()